@@ -9,130 +9,154 @@ from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
+import re
 from pathlib import Path
 
-app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
-
-# Mount the static files directory
-current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
-
-# In-memory activity database
-activities = {
-    "Soccer Team": {
-        "description": "Join the school soccer team and compete in matches",
-        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-        "max_participants": 22,
-        "participants": ["liam@mergington.edu", "noah@mergington.edu"]
-    },
-    "Basketball Team": {
-        "description": "Practice basketball skills and play in school tournaments",
-        "schedule": "Wednesdays and Fridays, 3:30 PM - 5:00 PM",
-        "max_participants": 15,
-        "participants": ["ava@mergington.edu", "james@mergington.edu"]
-    },
-    "Art Club": {
-        "description": "Explore painting, drawing, and other visual arts",
-        "schedule": "Mondays, 3:30 PM - 5:00 PM",
-        "max_participants": 15,
-        "participants": ["mia@mergington.edu", "charlotte@mergington.edu"]
-    },
-    "Drama Club": {
-        "description": "Act in plays and learn theater techniques",
-        "schedule": "Thursdays, 4:00 PM - 6:00 PM",
-        "max_participants": 25,
-        "participants": ["amelia@mergington.edu", "harper@mergington.edu"]
-    },
-    "Debate Club": {
-        "description": "Develop public speaking and argumentation skills",
-        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-        "max_participants": 16,
-        "participants": ["ethan@mergington.edu", "lucas@mergington.edu"]
-    },
-    "Science Club": {
-        "description": "Conduct experiments and explore scientific concepts",
-        "schedule": "Fridays, 4:00 PM - 5:30 PM",
-        "max_participants": 18,
-        "participants": ["isabella@mergington.edu", "benjamin@mergington.edu"]
-    },
-    "Chess Club": {
-        "description": "Learn strategies and compete in chess tournaments",
-        "schedule": "Fridays, 3:30 PM - 5:00 PM",
-        "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-    },
-    "Programming Class": {
-        "description": "Learn programming fundamentals and build software projects",
-        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-        "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-    },
-    "Gym Class": {
-        "description": "Physical education and sports activities",
-        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-        "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+# Compiled once at import so email validation pays no per-request compile cost
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _initial_activities():
+    """Build a fresh copy of the in-memory activity database.
+
+    Participants are stored as sets for O(1) membership checks and removal;
+    they are serialized as sorted lists in API responses.
+    """
+    return {
+        "Soccer Team": {
+            "description": "Join the school soccer team and compete in matches",
+            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+            "max_participants": 22,
+            "participants": {"liam@mergington.edu", "noah@mergington.edu"}
+        },
+        "Basketball Team": {
+            "description": "Practice basketball skills and play in school tournaments",
+            "schedule": "Wednesdays and Fridays, 3:30 PM - 5:00 PM",
+            "max_participants": 15,
+            "participants": {"ava@mergington.edu", "james@mergington.edu"}
+        },
+        "Art Club": {
+            "description": "Explore painting, drawing, and other visual arts",
+            "schedule": "Mondays, 3:30 PM - 5:00 PM",
+            "max_participants": 15,
+            "participants": {"mia@mergington.edu", "charlotte@mergington.edu"}
+        },
+        "Drama Club": {
+            "description": "Act in plays and learn theater techniques",
+            "schedule": "Thursdays, 4:00 PM - 6:00 PM",
+            "max_participants": 25,
+            "participants": {"amelia@mergington.edu", "harper@mergington.edu"}
+        },
+        "Debate Club": {
+            "description": "Develop public speaking and argumentation skills",
+            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+            "max_participants": 16,
+            "participants": {"ethan@mergington.edu", "lucas@mergington.edu"}
+        },
+        "Science Club": {
+            "description": "Conduct experiments and explore scientific concepts",
+            "schedule": "Fridays, 4:00 PM - 5:30 PM",
+            "max_participants": 18,
+            "participants": {"isabella@mergington.edu", "benjamin@mergington.edu"}
+        },
+        "Chess Club": {
+            "description": "Learn strategies and compete in chess tournaments",
+            "schedule": "Fridays, 3:30 PM - 5:00 PM",
+            "max_participants": 12,
+            "participants": {"michael@mergington.edu", "daniel@mergington.edu"}
+        },
+        "Programming Class": {
+            "description": "Learn programming fundamentals and build software projects",
+            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+            "max_participants": 20,
+            "participants": {"emma@mergington.edu", "sophia@mergington.edu"}
+        },
+        "Gym Class": {
+            "description": "Physical education and sports activities",
+            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+            "max_participants": 30,
+            "participants": {"john@mergington.edu", "olivia@mergington.edu"}
+        }
     }
-}
 
 
-@app.get("/")
-def root():
-    return RedirectResponse(url="/static/index.html")
+def create_app():
+    """Create a FastAPI app with its own activity database.
 
+    Returns the app together with its activities dict so callers (e.g. tests
+    running in parallel workers) get fully isolated state.
+    """
+    app = FastAPI(title="Mergington High School API",
+                  description="API for viewing and signing up for extracurricular activities")
 
-@app.get("/activities")
-def get_activities():
-    return activities
+    # Mount the static files directory
+    app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
+              "static")), name="static")
 
+    # In-memory activity database, private to this app instance
+    activities = _initial_activities()
 
-@app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
-    """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+    @app.get("/")
+    def root():
+        return RedirectResponse(url="/static/index.html")
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    @app.get("/activities")
+    def get_activities():
+        return {
+            name: {**details, "participants": sorted(details["participants"])}
+            for name, details in activities.items()
+        }
 
-    # Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up")
+    @app.post("/activities/{activity_name}/signup")
+    def signup_for_activity(activity_name: str, email: str):
+        """Sign up a student for an activity"""
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Validate activity has available spots
-    if len(activity["participants"]) >= activity["max_participants"]:
-        raise HTTPException(status_code=400, detail="Activity is full")
+        # Get the specific activity
+        activity = activities[activity_name]
 
-    # Add student
-    activity["participants"].append(email)
-    return {"message": f"Signed up {email} for {activity_name}"}
+        # Validate student is not already signed up
+        if email in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student already signed up")
 
+        # Validate activity has available spots
+        if len(activity["participants"]) >= activity["max_participants"]:
+            raise HTTPException(status_code=400, detail="Activity is full")
 
-@app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
-    """Unregister a student from an activity"""
-    # Validate email parameter
-    if not email or not email.strip():
-        raise HTTPException(status_code=400, detail="Email parameter is required")
-    
-    # Basic email format validation
-    if "@" not in email or "." not in email.split("@")[-1]:
-        raise HTTPException(status_code=400, detail="Invalid email format")
-    
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        # Add student
+        activity["participants"].add(email)
+        return {"message": f"Signed up {email} for {activity_name}"}
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    @app.delete("/activities/{activity_name}/unregister")
+    def unregister_from_activity(activity_name: str, email: str):
+        """Unregister a student from an activity"""
+        # Validate email parameter
+        if not email or not email.strip():
+            raise HTTPException(status_code=400, detail="Email parameter is required")
 
-    # Validate student is signed up
-    if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
+        # Basic email format validation
+        if not _EMAIL_RE.match(email):
+            raise HTTPException(status_code=400, detail="Invalid email format")
 
-    # Remove student
-    activity["participants"].remove(email)
-    return {"message": f"Unregistered {email} from {activity_name}"}
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        # Get the specific activity
+        activity = activities[activity_name]
+
+        # Validate student is signed up
+        if email not in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
+
+        # Remove student
+        activity["participants"].discard(email)
+        return {"message": f"Unregistered {email} from {activity_name}"}
+
+    return app, activities
+
+
+# Default instance used by uvicorn (e.g. `uvicorn src.app:app`)
+app, activities = create_app()
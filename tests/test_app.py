@@ -1,36 +1,67 @@
 """Tests for the High School Management System API"""
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
+import pytest_asyncio
+from src.app import create_app
 
+# URL templates built once at module scope; email goes through params= so
+# httpx handles query encoding and activity names with spaces work unchanged
+SIGNUP_URL = "/activities/{activity}/signup"
+UNREGISTER_URL = "/activities/{activity}/unregister"
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def app_and_activities():
+    """Build an app with its own activity state, isolated per worker"""
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def activities(app_and_activities):
+    """The activities dict backing this worker's app"""
+    return app_and_activities[1]
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities to original state before each test"""
-    # Store original participants
-    original_participants = {
-        name: details["participants"].copy()
+@pytest_asyncio.fixture(scope="session")
+async def client(app_and_activities):
+    """Create an async test client for the FastAPI app, shared across the session"""
+    transport = httpx.ASGITransport(app=app_and_activities[0])
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def original_participants(activities):
+    """Snapshot the pristine participant sets once per session.
+
+    Frozensets are immutable, so the baseline never needs re-copying per test.
+    """
+    return {
+        name: frozenset(details["participants"])
         for name, details in activities.items()
     }
+
+
+@pytest.fixture
+def reset_activities(activities, original_participants):
+    """Restore activities to their original state after each test.
+
+    Applied via usefixtures only on test classes that mutate participant
+    state; read-only tests skip the restore loop entirely.
+    """
     yield
-    # Restore original participants after test
     for name, participants in original_participants.items():
-        activities[name]["participants"] = participants
+        activities[name]["participants"].clear()
+        activities[name]["participants"].update(participants)
 
 
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities_returns_all_activities(self, client):
+    async def test_get_activities_returns_all_activities(self, client):
         """Test that all activities are returned"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         data = response.json()
         assert "Soccer Team" in data
@@ -38,9 +69,9 @@ class TestGetActivities:
         assert "Art Club" in data
         assert "Programming Class" in data
 
-    def test_get_activities_contains_required_fields(self, client):
+    async def test_get_activities_contains_required_fields(self, client):
         """Test that activities contain all required fields"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         
         for name, activity in data.items():
@@ -50,124 +81,103 @@ class TestGetActivities:
             assert "participants" in activity
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestSignup:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_success(self, client):
+    async def test_signup_success(self, client):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Soccer Team/signup?email=newstudent@mergington.edu"
+        response = await client.post(
+            SIGNUP_URL.format(activity="Soccer Team"),
+            params={"email": "newstudent@mergington.edu"},
         )
         assert response.status_code == 200
         assert "Signed up" in response.json()["message"]
 
-    def test_signup_adds_participant(self, client):
+    async def test_signup_adds_participant(self, client, activities):
         """Test that signup adds participant to the activity"""
         email = "teststudent@mergington.edu"
-        response = client.post(f"/activities/Art Club/signup?email={email}")
+        response = await client.post(SIGNUP_URL.format(activity="Art Club"),
+                                     params={"email": email})
         assert response.status_code == 200
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Art Club"]["participants"]
-
-    def test_signup_activity_not_found(self, client):
-        """Test signup for non-existent activity returns 404"""
-        response = client.post(
-            "/activities/Nonexistent Activity/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
+        assert email in activities["Art Club"]["participants"]
 
-    def test_signup_already_registered(self, client):
+    async def test_signup_already_registered(self, client):
         """Test that duplicate signup returns 400"""
         # First signup
-        response = client.post("/activities/Chess Club/signup?email=duplicate@mergington.edu")
+        url = SIGNUP_URL.format(activity="Chess Club")
+        response = await client.post(url, params={"email": "duplicate@mergington.edu"})
         assert response.status_code == 200
         # Second signup with same email
-        response = client.post(
-            "/activities/Chess Club/signup?email=duplicate@mergington.edu"
-        )
+        response = await client.post(url, params={"email": "duplicate@mergington.edu"})
         assert response.status_code == 400
         assert response.json()["detail"] == "Student already signed up"
 
-    def test_signup_activity_full(self, client):
+    async def test_signup_activity_full(self, client, activities):
         """Test that signup returns error when activity is full"""
-        # Fill up Chess Club (max 12 participants)
-        # First unregister existing participants
-        existing_response = client.get("/activities")
-        existing_participants = existing_response.json()["Chess Club"]["participants"].copy()
-        
-        for email in existing_participants:
-            client.delete(f"/activities/Chess Club/unregister?email={email}")
-        
-        # Add 12 participants to fill the activity
-        for i in range(12):
-            response = client.post(f"/activities/Chess Club/signup?email=student{i}@mergington.edu")
-            assert response.status_code == 200
-        
+        # Fill Chess Club (max 12 participants) directly in memory so only
+        # the overflow request exercises the HTTP stack
+        participants = activities["Chess Club"]["participants"]
+        participants.clear()
+        participants.update(f"student{i}@mergington.edu" for i in range(12))
+
         # Try to add 13th participant
-        response = client.post("/activities/Chess Club/signup?email=student13@mergington.edu")
+        response = await client.post(SIGNUP_URL.format(activity="Chess Club"),
+                                     params={"email": "student13@mergington.edu"})
         assert response.status_code == 400
         assert response.json()["detail"] == "Activity is full"
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_success(self, client):
+    async def test_unregister_success(self, client):
         """Test successful unregistration from an activity"""
         # Use an existing participant
-        response = client.delete(
-            "/activities/Soccer Team/unregister?email=liam@mergington.edu"
+        response = await client.delete(
+            UNREGISTER_URL.format(activity="Soccer Team"),
+            params={"email": "liam@mergington.edu"},
         )
         assert response.status_code == 200
         assert "Unregistered" in response.json()["message"]
 
-    def test_unregister_removes_participant(self, client):
+    async def test_unregister_removes_participant(self, client, activities):
         """Test that unregister removes participant from the activity"""
         email = "noah@mergington.edu"
-        response = client.delete(f"/activities/Soccer Team/unregister?email={email}")
+        response = await client.delete(UNREGISTER_URL.format(activity="Soccer Team"),
+                                       params={"email": email})
         assert response.status_code == 200
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Soccer Team"]["participants"]
-
-    def test_unregister_activity_not_found(self, client):
-        """Test unregister from non-existent activity returns 404"""
-        response = client.delete(
-            "/activities/Nonexistent Activity/unregister?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
-
-    def test_unregister_not_signed_up(self, client):
-        """Test unregister when not signed up returns 400"""
-        response = client.delete(
-            "/activities/Soccer Team/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Student is not signed up for this activity"
-
-    def test_unregister_empty_email(self, client):
-        """Test unregister with empty email returns 400"""
-        response = client.delete("/activities/Soccer Team/unregister?email=")
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Email parameter is required"
-
-    def test_unregister_invalid_email_format(self, client):
-        """Test unregister with invalid email format returns 400"""
-        response = client.delete("/activities/Soccer Team/unregister?email=invalidemail")
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Invalid email format"
+        assert email not in activities["Soccer Team"]["participants"]
+
+
+class TestErrorPaths:
+    """Parametrized tests for signup/unregister error responses"""
+
+    @pytest.mark.parametrize("method,path,email,status,detail", [
+        ("post", SIGNUP_URL.format(activity="Nonexistent Activity"),
+         "test@mergington.edu", 404, "Activity not found"),
+        ("delete", UNREGISTER_URL.format(activity="Nonexistent Activity"),
+         "test@mergington.edu", 404, "Activity not found"),
+        ("delete", UNREGISTER_URL.format(activity="Soccer Team"),
+         "notregistered@mergington.edu", 400, "Student is not signed up for this activity"),
+        ("delete", UNREGISTER_URL.format(activity="Soccer Team"),
+         "", 400, "Email parameter is required"),
+        ("delete", UNREGISTER_URL.format(activity="Soccer Team"),
+         "invalidemail", 400, "Invalid email format"),
+    ])
+    async def test_error_paths(self, client, method, path, email, status, detail):
+        """Test that invalid signup/unregister requests return the expected error"""
+        response = await client.request(method, path, params={"email": email})
+        assert response.status_code == status
+        assert response.json()["detail"] == detail
 
 
 class TestRootRedirect:
     """Tests for GET / endpoint"""
 
-    def test_root_redirects_to_index(self, client):
+    async def test_root_redirects_to_index(self, client):
         """Test that root path redirects to static index.html"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"